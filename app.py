@@ -1,4 +1,4 @@
-from flask import Flask, render_template, jsonify, send_file, request
+from flask import Flask, render_template, jsonify, send_file, request, g
 import sqlite3
 import csv
 import io
@@ -6,15 +6,38 @@ from datetime import datetime
 import os
 from scraper import scrape_hotels
 from honolulu_scraper import scrape_honolulu_glass_industry
+from page_cache import PageCache, init_data_version
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'glass-strategies-honolulu-2024'
 
 DATABASE = 'honolulu_hotels.db'
 
+# Rendered pages are cached until a scrape bumps the data version.
+# Set PAGE_CACHE_DIR to share rendered pages between gunicorn workers.
+page_cache = PageCache(DATABASE, cache_dir=os.environ.get('PAGE_CACHE_DIR'))
+
+# Seconds a request waits for a scrape's write lock before giving up
+DB_TIMEOUT = 30
+
+def get_db():
+    """Open one connection per request; sqlite3 connections must not be shared between threads"""
+    if 'db' not in g:
+        g.db = sqlite3.connect(DATABASE, timeout=DB_TIMEOUT)
+        g.db.row_factory = sqlite3.Row
+    return g.db
+
+@app.teardown_appcontext
+def close_db(exception):
+    conn = g.pop('db', None)
+    if conn is not None:
+        conn.close()
+
 def init_db():
     conn = sqlite3.connect(DATABASE)
     c = conn.cursor()
+    # WAL lets page views keep reading while a scrape is writing
+    c.execute('PRAGMA journal_mode=WAL')
     c.execute('''CREATE TABLE IF NOT EXISTS hotels
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
                   name TEXT NOT NULL,
@@ -34,32 +57,32 @@ def init_db():
                   decision_maker TEXT,
                   notes TEXT,
                   date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    init_data_version(c)
     conn.commit()
     conn.close()
 
 @app.route('/')
+@page_cache.cached()
 def index():
     return render_template('index.html')
 
 @app.route('/about')
+@page_cache.cached()
 def about():
     return render_template('about.html')
 
 @app.route('/leads')
+@page_cache.cached()
 def leads():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
+    c = get_db().cursor()
     c.execute('SELECT * FROM hotels ORDER BY date_added DESC')
     hotels = c.fetchall()
-    conn.close()
     return render_template('leads.html', hotels=hotels)
 
 @app.route('/businesses')
+@page_cache.cached(args=('type',))
 def businesses():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
+    c = get_db().cursor()
 
     # Get filter parameter
     business_type = request.args.get('type', 'all')
@@ -76,25 +99,20 @@ def businesses():
                  FROM businesses GROUP BY business_type ORDER BY count DESC''')
     type_stats = c.fetchall()
 
-    conn.close()
     return render_template('businesses.html', businesses=businesses, type_stats=type_stats, current_type=business_type)
 
 @app.route('/api/hotels')
 def api_hotels():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
+    c = get_db().cursor()
     c.execute('SELECT * FROM hotels')
     hotels = [dict(row) for row in c.fetchall()]
-    conn.close()
     return jsonify(hotels)
 
 @app.route('/export/csv')
 def export_csv():
     export_type = request.args.get('type', 'hotels')
 
-    conn = sqlite3.connect(DATABASE)
-    c = conn.cursor()
+    c = get_db().cursor()
 
     if export_type == 'all':
         # Export everything - hotels + businesses
@@ -118,7 +136,6 @@ def export_csv():
         filename = f'honolulu_hotels_{datetime.now().strftime("%Y%m%d")}.csv'
 
     data = c.fetchall()
-    conn.close()
 
     output = io.StringIO()
     writer = csv.writer(output)
@@ -43,6 +43,8 @@ EOF
 
 # 8. Create gunicorn service
 echo "Creating systemd service..."
+sudo mkdir -p /var/log/gunicorn /var/cache/honolulu
+sudo chown $USER:$USER /var/log/gunicorn /var/cache/honolulu
 sudo cat > /etc/systemd/system/honolulu.service << EOF
 [Unit]
 Description=Honolulu Hotel Scraper
@@ -52,7 +54,9 @@ After=network.target
 User=$USER
 WorkingDirectory=/var/www/honolulu
 Environment="PATH=/var/www/honolulu/venv/bin"
-ExecStart=/var/www/honolulu/venv/bin/gunicorn --workers 3 --bind unix:honolulu.sock -m 007 app:app
+Environment="PAGE_CACHE_DIR=/var/cache/honolulu"
+Environment="GUNICORN_PIDFILE=/var/www/honolulu/honolulu.pid"
+ExecStart=/var/www/honolulu/venv/bin/gunicorn -c gunicorn_config.py --bind unix:honolulu.sock -m 007 app:app
 
 [Install]
 WantedBy=multi-user.target
@@ -1,10 +1,30 @@
 import multiprocessing
+import os
 
 # Gunicorn configuration file
 bind = "0.0.0.0:5007"
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
-worker_connections = 1000
+
+# gthread (default): each worker serves requests from a thread pool, so slow
+# clients and CSV exports don't tie up a whole process. SQLite connections
+# are per-request in app.py, so the app is safe to run threaded.
+# sync: one request per worker, the old behaviour.
+# gevent: only if gevent is installed; SQLite calls still block the loop.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+
+if worker_class == "sync":
+    workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+else:
+    workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() + 1))
+
+# Threads per worker, used by gthread
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Max open client connections per worker, idle keep-alives included. Applies to
+# gthread as well as gevent/eventlet. A gthread worker at the cap stops
+# accepting, so new clients go to a less busy worker instead of queueing
+# behind its threads.
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 100))
+
 max_requests = 1000
 max_requests_jitter = 50
 timeout = 120
@@ -20,7 +40,12 @@ proc_name = 'honolulu_hotels'
 
 # Server mechanics
 daemon = False
-pidfile = '/var/run/honolulu.pid'
+pidfile = os.environ.get("GUNICORN_PIDFILE", '/var/run/honolulu.pid')
 user = None
 group = None
-tmp_upload_dir = None
\ No newline at end of file
+tmp_upload_dir = None
+
+def on_starting(server):
+    # Create tables and switch the database to WAL once, before workers fork
+    from app import init_db
+    init_db()
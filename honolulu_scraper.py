@@ -5,6 +5,7 @@ import re
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import time
+from page_cache import bump_data_version, init_data_version
 
 class HonoluluGlassIndustryScraper:
     """Comprehensive Honolulu glass industry lead scraper"""
@@ -45,6 +46,7 @@ class HonoluluGlassIndustryScraper:
                       decision_maker TEXT,
                       notes TEXT,
                       date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        init_data_version(c)
         conn.commit()
         conn.close()
 
@@ -268,6 +270,8 @@ class HonoluluGlassIndustryScraper:
             except Exception as e:
                 print(f"Error saving business {business['name']}: {e}")
 
+        if saved_count:
+            bump_data_version(conn)
         conn.commit()
         conn.close()
         return saved_count
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Local load test for the gunicorn deployment
+
+Builds a synthetic database in a temp directory, starts gunicorn against it
+with the real gunicorn_config.py once per worker configuration, and hammers
+/businesses, /api/hotels and /export/csv. Reports throughput and p50/p99
+latency per endpoint.
+
+Each configuration only sets GUNICORN_* environment variables; anything else
+in your environment (e.g. GUNICORN_WORKERS to match the droplet) is passed
+through. Only the bind address, log files and pidfile are overridden.
+
+Every endpoint gets a warm-up run before timing, so /businesses numbers are
+page cache hits, not SQLite + Jinja throughput. A worker recycled by
+max_requests starts cold, as it would in production. /api/hotels and
+/export/csv are uncached and query SQLite on every request. The server runs
+with PAGE_CACHE_DIR unset, so it never touches a real cache directory.
+
+    python load_test.py
+    python load_test.py --configs sync gthread --duration 20 --concurrency 32
+"""
+
+import argparse
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (path, label) pairs; the label marks which numbers come from the page cache
+ENDPOINTS = [
+    ('/businesses', 'page cache'),
+    ('/api/hotels', 'uncached'),
+    ('/export/csv?type=all', 'uncached'),
+]
+
+BUSINESS_TYPES = ['glass_contractor', 'window_installer', 'general_contractor',
+                  'architect', 'property_manager', 'commercial_builder']
+
+GUNICORN_CONFIG = os.path.join(REPO_DIR, 'gunicorn_config.py')
+
+# Environment overrides picked up by gunicorn_config.py
+CONFIGS = {
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync'},
+    'gthread': {'GUNICORN_WORKER_CLASS': 'gthread'},
+    'gthread-8': {'GUNICORN_WORKER_CLASS': 'gthread', 'GUNICORN_THREADS': '8'},
+}
+
+
+def build_database(workdir, hotel_count, business_count):
+    """Create the app's real schema in workdir and fill it with fake leads"""
+    cwd = os.getcwd()
+    sys.path.insert(0, REPO_DIR)
+    # Importing app builds a PageCache; keep it away from a real cache dir
+    os.environ['PAGE_CACHE_DIR'] = ''
+    os.chdir(workdir)
+    try:
+        from app import init_db, DATABASE
+        from honolulu_scraper import HonoluluGlassIndustryScraper
+        init_db()
+        HonoluluGlassIndustryScraper('').init_database()
+    finally:
+        os.chdir(cwd)
+
+    rng = random.Random(42)
+    conn = sqlite3.connect(os.path.join(workdir, DATABASE))
+    c = conn.cursor()
+    c.executemany("""INSERT INTO hotels
+                     (name, address, phone, email, website, property_type,
+                      floors, beachfront, star_rating)
+                     VALUES (?, ?, ?, ?, ?, 'hotel', ?, ?, ?)""",
+                  [(f"Hotel {i}", f"{i} Kalakaua Ave", f"(808) 555-{i % 10000:04d}",
+                    f"info@hotel{i}.com" if rng.random() < 0.7 else None,
+                    f"https://hotel{i}.com", rng.randint(2, 40),
+                    rng.random() < 0.4, round(rng.uniform(2, 5), 1))
+                   for i in range(hotel_count)])
+    c.executemany("""INSERT INTO businesses
+                     (name, business_type, specialty, address, phone, email, website, rating)
+                     VALUES (?, ?, 'Commercial glass', ?, ?, ?, ?, ?)""",
+                  [(f"Business {i}", rng.choice(BUSINESS_TYPES), f"{i} Nimitz Hwy",
+                    f"(808) 555-{i % 10000:04d}",
+                    f"contact@business{i}.com" if rng.random() < 0.6 else None,
+                    f"https://business{i}.com", round(rng.uniform(3, 5), 1))
+                   for i in range(business_count)])
+    conn.commit()
+    conn.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(workdir, port, name, log_file):
+    log_path = os.path.join(workdir, f'gunicorn_{name}.log')
+    cmd = [sys.executable, '-m', 'gunicorn', '-c', GUNICORN_CONFIG,
+           '--chdir', workdir, '--pythonpath', REPO_DIR,
+           '--bind', f'127.0.0.1:{port}',
+           '--access-logfile', os.devnull, '--error-logfile', log_path,
+           '--pid', os.path.join(workdir, f'gunicorn_{name}.pid'),
+           'app:app']
+    # Keep synthetic pages out of any PAGE_CACHE_DIR set for production
+    env = {**os.environ, 'PAGE_CACHE_DIR': '', **CONFIGS[name]}
+    proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/hotels', timeout=2).read()
+            return proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not start within 30 seconds")
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def run_endpoint(url, duration, concurrency):
+    """Hit url from `concurrency` client threads for `duration` seconds"""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def client():
+        nonlocal errors
+        local_latencies = []
+        local_errors = 0
+        while time.time() < stop_at:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                local_latencies.append(time.perf_counter() - start)
+            except (urllib.error.URLError, OSError):
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--configs', nargs='+', default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument('--hotels', type=int, default=500)
+    parser.add_argument('--businesses', type=int, default=5000)
+    parser.add_argument('--duration', type=float, default=10, help="seconds per endpoint")
+    parser.add_argument('--concurrency', type=int, default=16, help="client threads")
+    parser.add_argument('--warmup', type=float, default=3,
+                        help="untimed seconds per endpoint before measuring")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='honolulu_load_')
+    try:
+        print(f"Building synthetic database: {args.hotels} hotels, {args.businesses} businesses")
+        build_database(workdir, args.hotels, args.businesses)
+
+        results = []
+        for name in args.configs:
+            port = free_port()
+            overrides = ' '.join(f'{k}={v}' for k, v in CONFIGS[name].items())
+            print(f"\n=== {name}: {overrides} ===")
+            with open(os.path.join(workdir, f'gunicorn_{name}.out'), 'w') as log_file:
+                proc = start_gunicorn(workdir, port, name, log_file)
+                try:
+                    for endpoint, label in ENDPOINTS:
+                        url = f'http://127.0.0.1:{port}{endpoint}'
+                        # Reach every worker first so cold renders aren't timed
+                        run_endpoint(url, args.warmup, args.concurrency)
+                        result = run_endpoint(url, args.duration, args.concurrency)
+                        results.append((name, endpoint, label, result))
+                        print(f"{endpoint} ({label}): {result['rps']:.1f} req/s, "
+                              f"p50 {result['p50_ms']:.1f}ms, p99 {result['p99_ms']:.1f}ms, "
+                              f"{result['errors']} errors")
+                finally:
+                    proc.terminate()
+                    proc.wait()
+
+        print("\n=== Summary ===")
+        print(f"{'config':<12}{'endpoint':<24}{'cache':<16}{'req/s':>10}{'p50 ms':>10}"
+              f"{'p99 ms':>10}{'errors':>8}")
+        for name, endpoint, label, r in results:
+            print(f"{name:<12}{endpoint:<24}{label:<16}{r['rps']:>10.1f}{r['p50_ms']:>10.1f}"
+                  f"{r['p99_ms']:>10.1f}{r['errors']:>8}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import request, make_response
+
+
+def init_data_version(c):
+    """Create the data version row, called from the init_db paths.
+
+    db_id is random per database file, so a rebuilt database never matches
+    pages cached from an earlier one even when its counter restarts.
+    """
+    c.execute('''CREATE TABLE IF NOT EXISTS data_version
+                 (id INTEGER PRIMARY KEY CHECK (id = 0),
+                  db_id TEXT NOT NULL,
+                  version INTEGER NOT NULL DEFAULT 0)''')
+    c.execute('''INSERT OR IGNORE INTO data_version (id, db_id, version)
+                 VALUES (0, lower(hex(randomblob(8))), 0)''')
+
+
+def bump_data_version(conn):
+    """Bump the data version inside the caller's transaction.
+
+    Call this from any save path before conn.commit() so cached pages
+    are invalidated exactly when the new rows become visible.
+    """
+    conn.execute('UPDATE data_version SET version = version + 1 WHERE id = 0')
+
+
+class PageCache:
+    """Rendered-response cache keyed by route and the query args a view reads.
+
+    Entries live in a per-worker dict and, if cache_dir is set, in a shared
+    on-disk layer so other workers can skip the render too. Every entry is
+    tagged with the data version it was rendered at and is ignored once the
+    version moves on. Both layers hold at most max_entries pages.
+    """
+
+    def __init__(self, db_path, cache_dir=None, max_entries=256):
+        self.db_path = db_path
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _connection(self):
+        """Return this thread's read-only connection, reopening it if the db file was replaced"""
+        try:
+            inode = os.stat(self.db_path).st_ino
+        except OSError:
+            return None
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.inode == inode:
+            return conn
+        if conn is not None:
+            conn.close()
+        # mode=ro so a missing database is never created as an empty file
+        conn = sqlite3.connect(f'file:{os.path.abspath(self.db_path)}?mode=ro', uri=True)
+        self._local.conn = conn
+        self._local.inode = inode
+        return conn
+
+    def _data_version(self):
+        """Return a token for the current data, or None if the database isn't set up"""
+        try:
+            conn = self._connection()
+            if conn is None:
+                return None
+            row = conn.execute('SELECT db_id, version FROM data_version WHERE id = 0').fetchone()
+        except sqlite3.Error:
+            return None
+        return f'{row[0]}-{row[1]}' if row else None
+
+    def _key(self, arg_names):
+        # Views read args with request.args.get, so only the first value of each counts
+        args = [(name, request.args.get(name)) for name in arg_names if name in request.args]
+        return request.path + '?' + urlencode(args)
+
+    def _disk_path(self, key, version):
+        name = version + '-' + hashlib.sha1(key.encode()).hexdigest() + '.json'
+        return os.path.join(self.cache_dir, name)
+
+    def _load_from_disk(self, key, version):
+        try:
+            with open(self._disk_path(key, version)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != version:
+            return None
+        return entry
+
+    def _save_to_disk(self, key, entry):
+        version = entry['version']
+        try:
+            # Drop pages from older versions and stop writing once the dir is full
+            current = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                if name.startswith(version + '-'):
+                    current += 1
+                else:
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except FileNotFoundError:
+                        pass
+            if current >= self.max_entries:
+                return
+
+            # Write to a temp file and rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._disk_path(key, version))
+        except OSError as e:
+            print(f"Error writing page cache entry {key}: {e}")
+
+    def _remember(self, key, entry):
+        with self._lock:
+            # Drop entries rendered against an older version
+            stale = [k for k, e in self._memory.items() if e['version'] != entry['version']]
+            for k in stale:
+                del self._memory[k]
+            # Evict the oldest entries once the dict is full
+            while len(self._memory) >= self.max_entries:
+                del self._memory[next(iter(self._memory))]
+            self._memory[key] = entry
+
+    def get(self, key, version):
+        entry = self._memory.get(key)
+        if entry is not None and entry['version'] == version:
+            return entry
+        if self.cache_dir:
+            entry = self._load_from_disk(key, version)
+            if entry is not None:
+                self._remember(key, entry)
+                return entry
+        return None
+
+    def put(self, key, version, body, mimetype):
+        etag = f'{version}-' + hashlib.sha1(body.encode()).hexdigest()[:16]
+        entry = {'version': version, 'etag': etag, 'body': body, 'mimetype': mimetype}
+        self._remember(key, entry)
+        if self.cache_dir:
+            self._save_to_disk(key, entry)
+        return entry
+
+    def cached(self, args=()):
+        """Decorator that serves a view from the cache with ETag revalidation.
+
+        args lists the query args the view reads; any others are left out
+        of the key so junk query strings share one entry.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*view_args, **view_kwargs):
+                version = self._data_version()
+                if version is None:
+                    return view(*view_args, **view_kwargs)
+
+                key = self._key(args)
+                entry = self.get(key, version)
+
+                if entry is None:
+                    response = make_response(view(*view_args, **view_kwargs))
+                    if response.status_code != 200:
+                        return response
+                    entry = self.put(key, version, response.get_data(as_text=True), response.mimetype)
+
+                response = make_response(entry['body'])
+                response.mimetype = entry['mimetype']
+                response.set_etag(entry['etag'])
+                # Browsers may keep the page but must revalidate, since a scrape can land at any time
+                response.headers['Cache-Control'] = 'no-cache'
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
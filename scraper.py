@@ -5,6 +5,7 @@ import re
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import time
+from page_cache import bump_data_version
 
 class HonoluluHotelScraper:
     def __init__(self, serpapi_key):
@@ -155,6 +156,8 @@ class HonoluluHotelScraper:
             except Exception as e:
                 print(f"Error saving hotel {hotel['name']}: {e}")
 
+        if saved_count:
+            bump_data_version(conn)
         conn.commit()
         conn.close()
         return saved_count